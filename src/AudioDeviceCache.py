@@ -0,0 +1,94 @@
+"""
+Audio Device Cache for SimpleWhisper application.
+Keeps PortAudio host API and device enumeration results for reuse across dialogs.
+"""
+
+import functools
+import threading
+
+import sounddevice as sd
+
+
+class AudioDeviceCache:
+    """
+    Process-wide cache of PortAudio host API and device queries.
+
+    PortAudio builds its device list once when it is initialised, so these results
+    stay valid for the lifetime of the process.
+    """
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_hostapis() -> tuple:
+        """
+        Get all host APIs.
+
+        Returns:
+            Tuple of host API info dictionaries, indexed by host API id
+        """
+        return tuple(sd.query_hostapis())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_devices() -> tuple:
+        """
+        Get all audio devices.
+
+        Returns:
+            Tuple of device info dictionaries, indexed by device id
+        """
+        return tuple(sd.query_devices())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_input_devices_by_hostapi() -> tuple:
+        """
+        Get the input-capable devices of every host API.
+
+        Returns:
+            Tuple indexed by host API id of (device ids, device names, position of the
+            default input device in those lists or -1)
+        """
+        devices = AudioDeviceCache.get_devices()
+        result = []
+        for hostapi in AudioDeviceCache.get_hostapis():
+            default = hostapi['default_input_device']
+            device_ids, names = [], []
+            default_pos = -1
+            for idx in hostapi['devices']:
+                device = devices[idx]
+                if device['max_input_channels'] > 0:
+                    if idx == default:
+                        default_pos = len(device_ids)
+                    device_ids.append(idx)
+                    names.append(device['name'])
+            result.append((tuple(device_ids), tuple(names), default_pos))
+        return tuple(result)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_default_hostapi() -> int:
+        """
+        Get the default host API.
+
+        Returns:
+            Default host API id, or -1 if PortAudio reports none
+        """
+        try:
+            return sd.default.hostapi
+        except sd.PortAudioError:
+            return -1
+
+    @staticmethod
+    def prefetch_async():
+        """Fill every cache on a daemon thread so the first settings dialog finds them warm."""
+        threading.Thread(target=AudioDeviceCache._prefetch, daemon=True).start()
+
+    @staticmethod
+    def _prefetch():
+        """Worker thread: run each cached query once."""
+        try:
+            AudioDeviceCache.get_input_devices_by_hostapi()
+            AudioDeviceCache.get_default_hostapi()
+        except sd.PortAudioError as e:
+            print(f"Failed to prefetch audio devices: {e}")
@@ -1,18 +1,27 @@
-import queue
-import tempfile
 import threading
 import tkinter as tk
-import os
 from typing import Optional, Callable
+import numpy as np
 import sounddevice as sd
-import soundfile as sf
 
 
 class AudioManager:
+    # Stream format: 16 kHz mono 16-bit PCM is what Whisper consumes anyway
+    SAMPLE_RATE = 16000
+    CHANNELS = 1
+    DTYPE = 'int16'
+    LATENCY = 'low'
+    # Frames per audio callback
+    BLOCKSIZE = 1024
+    # Longest recording the preallocated scratch buffer can hold
+    MAX_RECORDING_SECONDS = 300
+    # Main-thread poll interval while waiting for the audio thread to finish a recording
+    CAPTURE_CHECK_MS = 10
+
     def __init__(self, 
                  on_recording_started: Optional[Callable[[], None]] = None,
                  on_recording_stopped: Optional[Callable[[], None]] = None,
-                 on_file_ready: Optional[Callable[[str], None]] = None,
+                 on_audio_ready: Optional[Callable[[np.ndarray, int], None]] = None,
                  on_error: Optional[Callable[[str], None]] = None,
                  root: Optional[tk.Tk] = None):
         """
@@ -21,29 +30,38 @@ class AudioManager:
         Args:
             on_recording_started: Called when recording starts
             on_recording_stopped: Called when recording stops
-            on_file_ready: Called when audio file is ready for transcription (receives file path)
+            on_audio_ready: Called when recorded audio is ready for transcription (receives PCM samples and samplerate)
             on_error: Called when an error occurs (receives error message)
             root: Tkinter root for scheduling callbacks on main thread
         """
         # Callbacks for UI updates
         self.on_recording_started = on_recording_started
         self.on_recording_stopped = on_recording_stopped
-        self.on_file_ready = on_file_ready
+        self.on_audio_ready = on_audio_ready
         self.on_error = on_error
         self.root = root
         
         # Audio system state
-        self.stream: Optional[sd.InputStream] = None
+        self.stream: Optional[sd.RawInputStream] = None
         self.current_device = None
         
         # Recording state
         self.recording = False
-        self.previously_recording = False
-        self.audio_q = queue.Queue()
+        # Stop flag: set by stop_recording, the audio thread acknowledges it once and clears it
+        self._completion_pending = threading.Event()
+        # Set by the audio thread once it has seen the end of a recording
+        self._capture_done = threading.Event()
         
-        # File and thread management
-        self.current_filename: Optional[str] = None
-        self.file_writer_thread: Optional[threading.Thread] = None
+        # Preallocated raw PCM recording buffer, sized once the stream samplerate is known
+        self._frame_bytes = self.CHANNELS * np.dtype(self.DTYPE).itemsize
+        self._scratch: Optional[bytearray] = None
+        self._scratch_mv: Optional[memoryview] = None
+        self._scratch_capacity = 0  # in bytes
+        self._scratch_pos = 0  # in bytes
+        # Pending root.after job that stops the recording when the scratch buffer fills
+        self._buffer_full_job = None
+        # Last non-empty PortAudio status flags seen by the audio callback
+        self._last_status = None
         
         # Initialize with default audio device
         self._create_stream()
@@ -51,7 +69,7 @@ class AudioManager:
     def _schedule_callback(self, callback: Callable, *args):
         """Schedule a callback to run on the main thread."""
         if callback and self.root:
-            self.root.after(0, lambda: callback(*args))
+            self.root.after(0, callback, *args)
         elif callback:
             # Fallback if no root provided
             callback(*args)
@@ -62,11 +80,18 @@ class AudioManager:
             if self.stream is not None:
                 self.stream.close()
                 
-            self.stream = sd.InputStream(
-                device=device, 
-                channels=1, 
-                callback=self._audio_callback
-            )
+            try:
+                self.stream = self._open_stream(device, self.SAMPLE_RATE)
+            except sd.PortAudioError:
+                # Some host APIs (e.g. WASAPI shared mode) only accept the device's native rate
+                self.stream = self._open_stream(device, None)
+            
+            size = self.MAX_RECORDING_SECONDS * int(self.stream.samplerate) * self._frame_bytes
+            if self._scratch is None or len(self._scratch) != size:
+                self._scratch = bytearray(size)
+                self._scratch_mv = memoryview(self._scratch)
+                self._scratch_capacity = size
+            
             self.stream.start()
             self.current_device = device
             
@@ -74,20 +99,38 @@ class AudioManager:
             self.stream = None
             self._schedule_callback(self.on_error, f"Failed to create audio stream: {str(e)}")
 
+    def _open_stream(self, device, samplerate: Optional[int]) -> sd.RawInputStream:
+        """Open a raw input stream with the fixed block size and sample format."""
+        return sd.RawInputStream(
+            device=device,
+            samplerate=samplerate,
+            channels=self.CHANNELS,
+            blocksize=self.BLOCKSIZE,
+            dtype=self.DTYPE,
+            latency=self.LATENCY,
+            callback=self._audio_callback
+        )
+
     def _audio_callback(self, indata, frames, time, status):
-        """Audio callback that handles data flow from stream to queue."""
+        """Audio callback that copies the raw PCM buffer into the scratch buffer."""
         if status:
-            # Log audio status issues but don't stop recording
-            print(f"Audio callback status: {status}")
+            # Keep the audio thread free of I/O; reported from the main thread with the recording
+            self._last_status = status
             
         if self.recording:
-            self.audio_q.put(indata.copy())
-            self.previously_recording = True
-        else:
-            if self.previously_recording:
-                # Signal end of recording to file writer
-                self.audio_q.put(None)
-                self.previously_recording = False
+            start = self._scratch_pos
+            end = start + frames * self._frame_bytes
+            if end > self._scratch_capacity:
+                # Buffer is full; drop anything past the limit until _on_buffer_full stops the recording
+                return
+            
+            self._scratch_mv[start:end] = indata
+            self._scratch_pos = end
+        elif self._completion_pending.is_set():
+            # Callbacks are serialized, so no further writes to the scratch buffer can happen.
+            # Only signal here: touching Tk would make the audio thread wait on the main loop.
+            self._completion_pending.clear()
+            self._capture_done.set()
 
     def set_device(self, device_id):
         """Change the audio input device."""
@@ -111,109 +154,90 @@ class AudioManager:
             return
 
         try:
-            # Clear any leftover data in queue
-            if self.audio_q.qsize() != 0:
-                print(f"WARNING: Audio queue not empty ({self.audio_q.qsize()} items). Clearing...")
-                while not self.audio_q.empty():
-                    try:
-                        self.audio_q.get_nowait()
-                    except queue.Empty:
-                        break
-
-            # Create temporary file for recording
-            self.current_filename = tempfile.mktemp(
-                prefix='delme_rec_gui_', 
-                suffix='.wav', 
-                dir=''
-            )
-
-            # Start file writer thread
-            self.file_writer_thread = threading.Thread(
-                target=self._file_writer_worker,
-                args=(
-                    self.current_filename,
-                    int(self.stream.samplerate),
-                    self.stream.channels,
-                ),
-                daemon=True
-            )
-            self.file_writer_thread.start()
+            # Rewind the scratch buffer
+            self._scratch_pos = 0
+            self._last_status = None
+            self._completion_pending.clear()
+            self._capture_done.clear()
 
             # Start recording
             self.recording = True
             self._schedule_callback(self.on_recording_started)
+            
+            if self.root:
+                # One timer for the moment the scratch buffer fills, instead of polling for it
+                self._cancel_buffer_full_job()
+                bytes_per_second = int(self.stream.samplerate) * self._frame_bytes
+                delay_ms = self._scratch_capacity * 1000 // bytes_per_second
+                self._buffer_full_job = self.root.after(delay_ms, self._on_buffer_full)
 
         except Exception as e:
             self.recording = False
-            self.current_filename = None
             self._schedule_callback(self.on_error, f"Failed to start recording: {str(e)}")
 
+    def _on_buffer_full(self):
+        """Stop the recording from the main thread once the scratch buffer is full."""
+        self._buffer_full_job = None
+        if self.recording:
+            print(f"WARNING: Recording reached the {self.MAX_RECORDING_SECONDS} s limit and was stopped")
+            self.stop_recording()
+
+    def _cancel_buffer_full_job(self):
+        """Cancel the pending buffer-full timer, if any."""
+        if self._buffer_full_job is not None:
+            self.root.after_cancel(self._buffer_full_job)
+            self._buffer_full_job = None
+
     def stop_recording(self):
-        """Stop audio recording and wait for file completion."""
+        """Stop audio recording and wait for the audio thread to finish writing."""
         if not self.recording:
             self._schedule_callback(self.on_error, "No recording in progress")
             return
 
         try:
             # Stop recording
+            self._completion_pending.set()
             self.recording = False
+            if self.root:
+                self._cancel_buffer_full_job()
             self._schedule_callback(self.on_recording_stopped)
             
-            # Wait for file writer thread to complete
-            self._wait_for_file_completion()
+            # Wait for the audio callback to see the end of recording
+            self._wait_for_capture_completion()
 
         except Exception as e:
             self._schedule_callback(self.on_error, f"Failed to stop recording: {str(e)}")
 
-    def _wait_for_file_completion(self):
-        """Wait for file writer thread to complete and signal file ready."""
-        if self.file_writer_thread and self.file_writer_thread.is_alive():
-            # Schedule another check in 10ms
+    def _wait_for_capture_completion(self):
+        """Wait for the audio thread to release the scratch buffer and signal audio ready."""
+        if not self._capture_done.is_set():
+            # Check again on the next poll
             if self.root:
-                self.root.after(10, self._wait_for_file_completion)
+                self.root.after(self.CAPTURE_CHECK_MS, self._wait_for_capture_completion)
             else:
                 # Fallback: block and wait
-                self.file_writer_thread.join()
-                self._file_completion_handler()
+                self._capture_done.wait()
+                self._capture_completion_handler()
         else:
-            self._file_completion_handler()
+            self._capture_completion_handler()
 
-    def _file_writer_worker(self, filename: str, samplerate: int, channels: int):
-        """Worker method to write audio data from queue to file."""
+    def _capture_completion_handler(self):
+        """Hand the recorded samples over for transcription."""
         try:
-            with sf.SoundFile(
-                file=filename,
-                mode='x',
-                samplerate=samplerate,
-                channels=channels
-            ) as f:
-                while True:
-                    data = self.audio_q.get()
-                    if data is None:
-                        # End of recording signal
-                        break
-                    f.write(data)
-        except Exception as e:
-            # Schedule error callback on main thread
-            self._schedule_callback(self.on_error, f"Error writing audio file: {str(e)}")
-
-    def _file_completion_handler(self):
-        """Handle completion of file writing."""
-        try:
-            if self.file_writer_thread:
-                self.file_writer_thread.join(timeout=1.0)  # Wait up to 1 second
+            if self._last_status:
+                # Log audio status issues but don't discard the recording
+                print(f"Audio callback status: {self._last_status}")
                 
-            if self.current_filename:
-                # File is ready for transcription
-                self._schedule_callback(self.on_file_ready, self.current_filename)
+            if self._scratch_pos:
+                # Copy out so the scratch buffer can be reused by the next recording
+                pcm = np.frombuffer(self._scratch_mv[:self._scratch_pos], dtype=self.DTYPE)
+                pcm = pcm.reshape(-1, self.CHANNELS).copy()
+                self._schedule_callback(self.on_audio_ready, pcm, int(self.stream.samplerate))
             else:
-                self._schedule_callback(self.on_error, "Recording completed but no file was created")
+                self._schedule_callback(self.on_error, "Recording completed but no audio was captured")
                 
         except Exception as e:
-            self._schedule_callback(self.on_error, f"Error completing file write: {str(e)}")
-        finally:
-            # Reset file writer thread
-            self.file_writer_thread = None
+            self._schedule_callback(self.on_error, f"Error completing recording: {str(e)}")
 
     def is_recording(self) -> bool:
         """Check if currently recording."""
@@ -230,21 +254,13 @@ class AudioManager:
             if self.recording:
                 self.recording = False
                 
-            # Wait for file writer thread
-            if self.file_writer_thread and self.file_writer_thread.is_alive():
-                self.file_writer_thread.join(timeout=2.0)
-                
             # Close audio stream
             if self.stream:
                 self.stream.close()
                 self.stream = None
                 
-            # Clear queue
-            while not self.audio_q.empty():
-                try:
-                    self.audio_q.get_nowait()
-                except queue.Empty:
-                    break
+            # Discard recorded audio
+            self._scratch_pos = 0
                     
         except Exception as e:
             print(f"Error during AudioManager cleanup: {e}")
@@ -253,34 +269,6 @@ class AudioManager:
         """Get the current audio device ID."""
         return self.current_device
 
-    def cleanup_audio_file(self, file_path: str) -> bool:
-        """
-        Clean up a temporary audio file.
-        
-        Args:
-            file_path: Path to the audio file to delete
-            
-        Returns:
-            True if cleanup was successful, False otherwise
-        """
-        if not file_path:
-            return True
-            
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"Cleaned up temporary audio file: {file_path}")
-                return True
-            else:
-                print(f"Audio file not found for cleanup: {file_path}")
-                return True  # File doesn't exist, so cleanup is "successful"
-                
-        except Exception as e:
-            print(f"Failed to cleanup audio file {file_path}: {e}")
-            if self.on_error:
-                self._schedule_callback(self.on_error, f"Failed to cleanup temporary file: {str(e)}")
-            return False
-
     def __del__(self):
         """Ensure cleanup on object destruction."""
         self.cleanup()
\ No newline at end of file
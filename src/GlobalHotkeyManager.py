@@ -3,9 +3,10 @@ Global Hotkey Manager for SimpleWhisper application.
 Handles system-wide hotkey registration and management.
 """
 
+import functools
 import threading
 import tkinter as tk
-from typing import Callable, Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, Tuple
 from pynput import keyboard
 from pynput.keyboard import Key, KeyCode
 
@@ -34,7 +35,7 @@ class GlobalHotkeyManager:
     def _schedule_callback(self, callback: Callable, *args):
         """Schedule a callback to run on the main thread."""
         if callback and self.root:
-            self.root.after(0, lambda: callback(*args))
+            self.root.after(0, callback, *args)
         elif callback:
             # Fallback if no root provided
             callback(*args)
@@ -62,15 +63,19 @@ class GlobalHotkeyManager:
             hotkey_string: Hotkey combination (e.g., '<ctrl>+<shift>+r')
             callback: Function to call when hotkey is pressed
         """
-        parsed_hotkey = self._parse_hotkey(hotkey_string)
-        
-        # Wrap callback to ensure it runs on main thread
-        def wrapped_callback():
-            self._schedule_callback(callback)
+        self.register_hotkeys({name: (hotkey_string, callback)})
+    
+    def register_hotkeys(self, mapping: Dict[str, Tuple[str, Callable]]):
+        """
+        Register several global hotkeys with a single listener restart.
         
-        self.hotkeys[parsed_hotkey] = wrapped_callback
+        Args:
+            mapping: Dictionary of name -> (hotkey combination, callback)
+        """
+        for hotkey_string, callback in mapping.values():
+            self.hotkeys[self._parse_hotkey(hotkey_string)] = callback
         
-        # If listener is active, restart it to include new hotkey
+        # If listener is active, restart it once to include the new hotkeys
         if self.is_active:
             self._restart_listener()
     
@@ -96,7 +101,11 @@ class GlobalHotkeyManager:
             return
             
         try:
-            self.listener = keyboard.GlobalHotKeys(self.hotkeys)
+            # Dispatch through _schedule_callback so callbacks run on the main thread
+            self.listener = keyboard.GlobalHotKeys({
+                hotkey: functools.partial(self._schedule_callback, callback)
+                for hotkey, callback in self.hotkeys.items()
+            })
             self.listener.start()
             self.is_active = True
             
@@ -139,16 +148,10 @@ class GlobalHotkeyManager:
             toggle_callback: Callback for toggle recording hotkey
             stop_callback: Callback for stop recording hotkey
         """
-        self.register_hotkey(
-            'toggle_recording',
-            self.default_hotkeys['toggle_recording'],
-            toggle_callback
-        )
-        self.register_hotkey(
-            'stop_recording', 
-            self.default_hotkeys['stop_recording'],
-            stop_callback
-        )
+        self.register_hotkeys({
+            'toggle_recording': (self.default_hotkeys['toggle_recording'], toggle_callback),
+            'stop_recording': (self.default_hotkeys['stop_recording'], stop_callback)
+        })
     
     def cleanup(self):
         """Clean up hotkey listener resources."""
@@ -164,7 +167,8 @@ class HotkeyValidator:
     """Utility class for validating hotkey combinations."""
     
     VALID_MODIFIERS = {'ctrl', 'shift', 'alt', 'cmd', 'win'}
-    RESERVED_COMBINATIONS = {
+    # Stored lowercase so lookups only need the input lowered once
+    RESERVED_COMBINATIONS: frozenset[str] = frozenset({
         '<ctrl>+c',  # Copy
         '<ctrl>+v',  # Paste
         '<ctrl>+x',  # Cut
@@ -172,7 +176,7 @@ class HotkeyValidator:
         '<ctrl>+y',  # Redo
         '<alt>+<f4>',  # Close window
         '<ctrl>+<alt>+<del>',  # Task manager
-    }
+    })
     
     @classmethod
     def is_valid_hotkey(cls, hotkey_string: str) -> tuple[bool, str]:
@@ -188,14 +192,16 @@ class HotkeyValidator:
         if not hotkey_string:
             return False, "Hotkey cannot be empty"
         
+        hk = hotkey_string.lower()
+        
         # Check for reserved combinations
-        if hotkey_string.lower() in cls.RESERVED_COMBINATIONS:
+        if hk in cls.RESERVED_COMBINATIONS:
             return False, f"Hotkey {hotkey_string} is reserved by the system"
         
         # Basic format validation
-        if not hotkey_string.startswith('<') or not hotkey_string.endswith('>'):
+        if not hk.startswith('<') or not hk.endswith('>'):
             # Allow simple key format
-            if '+' not in hotkey_string:
+            if '+' not in hk:
                 return True, ""
         
         # More detailed validation could be added here
@@ -14,6 +14,32 @@ from GlobalHotkeyManager import HotkeyValidator
 from SettingsManager import SettingsManager
 from UIConstants import UIConstants
 
+# Capture strings used on every capture start/stop
+_CAPTURE_PROMPT = UIConstants.HOTKEY_CAPTURE_PROMPT
+_CAPTURE_BTN = UIConstants.HOTKEY_CAPTURE_BUTTON
+_STOP_BTN = UIConstants.HOTKEY_STOP_CAPTURE_BUTTON
+_NONE_DISPLAY = UIConstants.HOTKEY_NONE_DISPLAY
+
+# Bit assigned to each modifier, including left/right variants
+_MOD_BIT = {
+    Key.ctrl: 1, Key.ctrl_l: 1, Key.ctrl_r: 1,
+    Key.shift: 2, Key.shift_l: 2, Key.shift_r: 2,
+    Key.alt: 4, Key.alt_l: 4, Key.alt_r: 4,
+    Key.cmd: 8, Key.cmd_l: 8, Key.cmd_r: 8,
+}
+_MOD_NAMES = ((1, "ctrl"), (2, "shift"), (4, "alt"), (8, "cmd"))
+# Display position of each modifier bit during capture
+_MOD_SLOT = {1: 0, 2: 1, 4: 2, 8: 3}
+
+# Capture display label for every special key ("Ctrl_l", "F5", ...)
+_KEY_DISPLAY = {key: key.name.capitalize() for key in Key}
+
+# Modifier prefix for every bitmask, in the sorted pynput format ("<alt>+<ctrl>")
+_MOD_STR = tuple(
+    "+".join(f"<{name}>" for name in sorted(name for bit, name in _MOD_NAMES if mask & bit))
+    for mask in range(16)
+)
+
 
 class HotkeyEntryWidget(ttk.Frame):
     """Widget for capturing and displaying hotkey combinations."""
@@ -52,7 +78,7 @@ class HotkeyEntryWidget(ttk.Frame):
         # Capture button
         self.capture_button = ttk.Button(
             self,
-            text=UIConstants.HOTKEY_CAPTURE_BUTTON,
+            text=_CAPTURE_BTN,
             command=self._toggle_capture
         )
         self.capture_button.pack(side=tk.LEFT, padx=(0, 5))
@@ -67,7 +93,7 @@ class HotkeyEntryWidget(ttk.Frame):
     
     def _update_display(self):
         """Update the hotkey display."""
-        display_text = self.current_hotkey if self.current_hotkey else UIConstants.HOTKEY_NONE_DISPLAY
+        display_text = self.current_hotkey if self.current_hotkey else _NONE_DISPLAY
         self.hotkey_var.set(display_text)
     
     def _toggle_capture(self):
@@ -81,8 +107,8 @@ class HotkeyEntryWidget(ttk.Frame):
         """Start capturing hotkey input."""
         self.is_capturing = True
         self.pressed_keys.clear()
-        self.capture_button.config(text=UIConstants.HOTKEY_STOP_CAPTURE_BUTTON, state='normal')
-        self.hotkey_var.set(UIConstants.HOTKEY_CAPTURE_PROMPT)
+        self.capture_button.config(text=_STOP_BTN, state='normal')
+        self.hotkey_var.set(_CAPTURE_PROMPT)
         
         # Start listening for key presses
         self.capture_listener = keyboard.Listener(
@@ -93,13 +119,13 @@ class HotkeyEntryWidget(ttk.Frame):
     
     def _stop_capture(self):
         """Stop capturing hotkey input."""
-        self.is_capturing = False
-        self.capture_button.config(text=UIConstants.HOTKEY_CAPTURE_BUTTON, state='normal')
-        
+        # Stop the listener first so no further key events are delivered
         if self.capture_listener:
             self.capture_listener.stop()
             self.capture_listener = None
         
+        self.is_capturing = False
+        self.capture_button.config(text=_CAPTURE_BTN, state='normal')
         self._update_display()
     
     def _on_key_press(self, key):
@@ -112,6 +138,10 @@ class HotkeyEntryWidget(ttk.Frame):
             self._stop_capture()
             return
         
+        # Ignore OS auto-repeat of keys that are already held
+        if key in self.pressed_keys:
+            return
+        
         self.pressed_keys.add(key)
         self._update_capture_display()
     
@@ -134,17 +164,23 @@ class HotkeyEntryWidget(ttk.Frame):
         if not self.pressed_keys:
             return
         
-        display_keys = []
+        # Modifiers go into fixed Ctrl/Shift/Alt/Cmd slots, other keys follow
+        slots = [None, None, None, None]
+        other_keys = []
         for key in self.pressed_keys:
             if isinstance(key, Key):
-                display_keys.append(key.name.capitalize())
+                bit = _MOD_BIT.get(key)
+                if bit:
+                    slots[_MOD_SLOT[bit]] = _KEY_DISPLAY[key]
+                else:
+                    other_keys.append(_KEY_DISPLAY[key])
             elif isinstance(key, KeyCode):
                 if key.char:
-                    display_keys.append(key.char.upper())
+                    other_keys.append(key.char.upper())
                 else:
-                    display_keys.append(f"Key({key.vk})")
+                    other_keys.append(f"Key({key.vk})")
         
-        self.hotkey_var.set(" + ".join(sorted(display_keys)))
+        self.hotkey_var.set(" + ".join([label for label in slots if label] + other_keys))
     
     def _convert_keys_to_string(self, keys) -> str:
         """
@@ -156,38 +192,25 @@ class HotkeyEntryWidget(ttk.Frame):
         Returns:
             Hotkey string in pynput format
         """
-        modifiers = []
+        mask = 0
         regular_key = None
         
         for key in keys:
-            if isinstance(key, Key):
-                if key in [Key.ctrl, Key.ctrl_l, Key.ctrl_r]:
-                    modifiers.append("ctrl")
-                elif key in [Key.shift, Key.shift_l, Key.shift_r]:
-                    modifiers.append("shift")
-                elif key in [Key.alt, Key.alt_l, Key.alt_r]:
-                    modifiers.append("alt")
-                elif key in [Key.cmd, Key.cmd_l, Key.cmd_r]:
-                    modifiers.append("cmd")
-                else:
-                    # Function keys and other special keys
-                    regular_key = key.name.lower()
+            bit = _MOD_BIT.get(key)
+            if bit:
+                mask |= bit
+            elif type(key) is Key:
+                # Function keys and other special keys
+                regular_key = key.name.lower()
             elif isinstance(key, KeyCode):
                 if key.char and key.char.isalnum():
                     regular_key = key.char.lower()
         
         # Must have at least one modifier and one regular key
-        if not modifiers or not regular_key:
+        if not mask or not regular_key:
             return ""
         
-        # Remove duplicates and sort
-        modifiers = sorted(list(set(modifiers)))
-        
-        # Build hotkey string
-        parts = [f"<{mod}>" for mod in modifiers]
-        parts.append(regular_key)
-        
-        return "+".join(parts)
+        return f"{_MOD_STR[mask]}+{regular_key}"
     
     def _clear_hotkey(self):
         """Clear the current hotkey."""
@@ -209,6 +232,12 @@ class HotkeyEntryWidget(ttk.Frame):
 class HotkeySettingsWindow(tk.Toplevel):
     """Window for configuring global hotkeys."""
     
+    # (action, label) for each configurable hotkey, in display order
+    _ACTIONS = (
+        ("toggle_recording", UIConstants.HOTKEY_TOGGLE_RECORDING_LABEL),
+        ("stop_recording", UIConstants.HOTKEY_STOP_RECORDING_LABEL),
+    )
+    
     def __init__(self, parent, settings_manager: SettingsManager, on_save: Optional[Callable] = None):
         """
         Initialize HotkeySettingsWindow.
@@ -251,7 +280,7 @@ class HotkeySettingsWindow(tk.Toplevel):
         title_label = ttk.Label(
             main_frame,
             text="Configure Global Hotkeys",
-            font=("Segoe UI", 12, "bold")
+            font=UIConstants.FONT_HEADING
         )
         title_label.pack(pady=(0, 15))
         
@@ -268,27 +297,17 @@ class HotkeySettingsWindow(tk.Toplevel):
         settings_frame = ttk.LabelFrame(main_frame, text="Hotkey Assignments", padding="10")
         settings_frame.pack(fill=tk.X, pady=(0, 20))
         
-        # Toggle Recording hotkey
-        toggle_frame = ttk.Frame(settings_frame)
-        toggle_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(toggle_frame, text=UIConstants.HOTKEY_TOGGLE_RECORDING_LABEL, width=15).pack(side=tk.LEFT)
-        self.hotkey_widgets["toggle_recording"] = HotkeyEntryWidget(
-            toggle_frame,
-            on_change=lambda hk: self._on_hotkey_change("toggle_recording", hk)
-        )
-        self.hotkey_widgets["toggle_recording"].pack(side=tk.RIGHT)
-        
-        # Stop Recording hotkey
-        stop_frame = ttk.Frame(settings_frame)
-        stop_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(stop_frame, text=UIConstants.HOTKEY_STOP_RECORDING_LABEL, width=15).pack(side=tk.LEFT)
-        self.hotkey_widgets["stop_recording"] = HotkeyEntryWidget(
-            stop_frame,
-            on_change=lambda hk: self._on_hotkey_change("stop_recording", hk)
-        )
-        self.hotkey_widgets["stop_recording"].pack(side=tk.RIGHT)
+        for action, label in self._ACTIONS:
+            row_frame = ttk.Frame(settings_frame)
+            row_frame.pack(fill=tk.X, pady=(0, 10))
+            
+            ttk.Label(row_frame, text=label, width=15).pack(side=tk.LEFT)
+            widget = HotkeyEntryWidget(
+                row_frame,
+                on_change=lambda hk, action=action: self._on_hotkey_change(action, hk)
+            )
+            widget.pack(side=tk.RIGHT)
+            self.hotkey_widgets[action] = widget
         
         # Validation status
         self.status_label = ttk.Label(main_frame, text="", foreground="red")
@@ -319,11 +338,10 @@ class HotkeySettingsWindow(tk.Toplevel):
     def _load_current_settings(self):
         """Load current hotkey settings into widgets."""
         current_hotkeys = self.settings_manager.get_all_hotkeys()
+        self.pending_changes = {action: current_hotkeys.get(action, "") for action in self.hotkey_widgets}
         
         for action, widget in self.hotkey_widgets.items():
-            hotkey = current_hotkeys.get(action, "")
-            widget.set_hotkey(hotkey)
-            self.pending_changes[action] = hotkey
+            widget.set_hotkey(self.pending_changes[action])
     
     def _on_hotkey_change(self, action: str, hotkey: str):
         """Handle hotkey change in widget."""
@@ -333,14 +351,15 @@ class HotkeySettingsWindow(tk.Toplevel):
     def _validate_all_hotkeys(self):
         """Validate all current hotkey combinations."""
         errors = []
-        hotkeys_in_use = []
+        hotkeys_in_use = set()
+        validate = HotkeyValidator.is_valid_hotkey
         
         for action, hotkey in self.pending_changes.items():
             if not hotkey:  # Empty hotkey is allowed
                 continue
             
             # Validate individual hotkey
-            is_valid, error_msg = HotkeyValidator.is_valid_hotkey(hotkey)
+            is_valid, error_msg = validate(hotkey)
             if not is_valid:
                 errors.append(f"{action.replace('_', ' ').title()}: {error_msg}")
                 continue
@@ -349,7 +368,7 @@ class HotkeySettingsWindow(tk.Toplevel):
             if hotkey in hotkeys_in_use:
                 errors.append(f"Duplicate hotkey: {hotkey}")
             else:
-                hotkeys_in_use.append(hotkey)
+                hotkeys_in_use.add(hotkey)
         
         # Update status
         if errors:
@@ -357,7 +376,7 @@ class HotkeySettingsWindow(tk.Toplevel):
         else:
             self.status_label.config(text=UIConstants.HOTKEY_VALIDATION_SUCCESS, foreground="green")
         
-        return len(errors) == 0
+        return not errors
     
     def _reset_to_defaults(self):
         """Reset all hotkeys to default values."""
@@ -373,6 +392,7 @@ class HotkeySettingsWindow(tk.Toplevel):
                 "stop_recording": UIConstants.GLOBAL_HOTKEY_STOP_RECORDING
             }
             
+            # set_hotkey does not fire on_change, so validation runs once after the loop
             for action, hotkey in defaults.items():
                 if action in self.hotkey_widgets:
                     self.hotkey_widgets[action].set_hotkey(hotkey)
@@ -390,8 +410,9 @@ class HotkeySettingsWindow(tk.Toplevel):
             )
             return
         
-        # Save hotkeys
-        success = self.settings_manager.set_all_hotkeys(self.pending_changes)
+        # Save hotkeys, writing now so a failed write is reported here
+        self.settings_manager.set_all_hotkeys(self.pending_changes)
+        success = self.settings_manager.flush()
         
         if success:
             messagebox.showinfo(
@@ -1,20 +1,15 @@
 import tkinter as tk
+from typing import Optional
 from tkinter import messagebox
 from tkinter import ttk
 
-import pyperclip
-
-from SettingsWindow import SettingsWindow
-from WhisperManager import WhisperManager
-from AudioManager import AudioManager
 from UIConstants import UIConstants
-from UIStateManager import UIStateManager, AppState
+from UIStateManager import UIStateManager, AppState, ButtonState, BUSY_STATES
 from GlobalHotkeyManager import GlobalHotkeyManager, HotkeyValidator
 from SettingsManager import SettingsManager
 
 
 class MainWindow(tk.Tk):
-
     def __init__(self):
         super().__init__()
         
@@ -22,7 +17,10 @@ class MainWindow(tk.Tk):
         self.settings_manager = SettingsManager()
         
         # Initialize state manager
-        self.state_manager = UIStateManager(ui_update_callback=self._on_state_changed)
+        self.state_manager = UIStateManager(ui_update_callback=self._on_state_changed,
+                                            schedule_idle=self.after_idle)
+        # Button states last applied to the widgets, used to skip unchanged configure calls
+        self._last_button_states: Optional[ButtonState] = None
         
         # Configure main window
         self._setup_window()
@@ -54,21 +52,32 @@ class MainWindow(tk.Tk):
 
     def _initialize_managers(self):
         """Initialize WhisperManager and AudioManager with callbacks."""
+        # Map the (still empty) top-level window so the app is visibly starting while torch,
+        # whisper and sounddevice load; these modules are imported here rather than at the top
+        self.update_idletasks()
+        from WhisperManager import WhisperManager
+        from AudioManager import AudioManager
+        from AudioDeviceCache import AudioDeviceCache
+        
         self.whisper_manager = WhisperManager(
             on_model_loaded=self.on_model_loaded,
             on_transcription_complete=self.on_transcription_complete,
             on_error=self.on_whisper_error,
-            settings_manager=self.settings_manager
+            settings_manager=self.settings_manager,
+            root=self
         )
         
         self.audio_manager = AudioManager(
             on_recording_started=self.on_recording_started,
             on_recording_stopped=self.on_recording_stopped,
-            on_file_ready=self.on_file_ready,
+            on_audio_ready=self.on_audio_ready,
             on_error=self.on_audio_error,
             root=self
         )
         
+        # Enumerate audio devices in the background so Settings opens without a PortAudio scan
+        AudioDeviceCache.prefetch_async()
+        
         # Initialize global hotkey manager
         self.hotkey_manager = GlobalHotkeyManager(root=self)
         self.global_hotkeys_enabled = self.settings_manager.is_global_hotkeys_enabled()
@@ -140,6 +149,7 @@ class MainWindow(tk.Tk):
         )
         self.progress_bar.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(UIConstants.PADDING_SMALL, 0))
         self.progress_bar.grid_remove()  # Hide initially
+        self._progress_running = False
 
     def _create_status_frame(self):
         """Create the status display frame."""
@@ -166,6 +176,8 @@ class MainWindow(tk.Tk):
         # Insert initial status message
         self.status_text.insert(tk.END, UIConstants.STATUS_READY)
         self.status_text.config(state=tk.DISABLED)
+        # Status currently shown, so unchanged messages skip the redraw
+        self._status_message = UIConstants.STATUS_READY
 
     def _create_info_frame(self):
         """Create the information display frame."""
@@ -199,9 +211,9 @@ class MainWindow(tk.Tk):
 
     def _setup_keyboard_shortcuts(self):
         """Set up keyboard shortcuts."""
-        self.bind_all(UIConstants.SHORTCUT_RECORD, self._on_record_shortcut)
-        self.bind_all(UIConstants.SHORTCUT_STOP, self._on_stop_shortcut)
-        self.bind_all(UIConstants.SHORTCUT_SETTINGS, lambda e: self.on_settings())
+        self.bind(UIConstants.SHORTCUT_RECORD, self._on_record_shortcut)
+        self.bind(UIConstants.SHORTCUT_STOP, self._on_stop_shortcut)
+        self.bind(UIConstants.SHORTCUT_SETTINGS, lambda e: self.on_settings())
 
     def _setup_global_hotkeys(self):
         """Set up global hotkeys that work system-wide."""
@@ -212,19 +224,14 @@ class MainWindow(tk.Tk):
             toggle_hotkey = hotkeys.get('toggle_recording', '')
             stop_hotkey = hotkeys.get('stop_recording', '')
             
+            to_register = {}
             if toggle_hotkey:
-                self.hotkey_manager.register_hotkey(
-                    'toggle_recording',
-                    toggle_hotkey,
-                    self._on_global_toggle_recording
-                )
+                to_register['toggle_recording'] = (toggle_hotkey, self._on_global_toggle_recording)
             
             if stop_hotkey:
-                self.hotkey_manager.register_hotkey(
-                    'stop_recording', 
-                    stop_hotkey,
-                    self._on_global_stop_recording
-                )
+                to_register['stop_recording'] = (stop_hotkey, self._on_global_stop_recording)
+            
+            self.hotkey_manager.register_hotkeys(to_register)
             
             # Start listening for global hotkeys
             if self.global_hotkeys_enabled:
@@ -245,36 +252,49 @@ class MainWindow(tk.Tk):
         """Called when application state changes. Updates UI accordingly."""
         # Update button states
         button_states = self.state_manager.get_button_states()
+        last = self._last_button_states
         
-        self.record_button.configure(
-            text=button_states['record_text'],
-            state='normal' if button_states['record_enabled'] else 'disabled'
-        )
+        if (last is None or button_states.record_text != last.record_text
+                or button_states.record_enabled != last.record_enabled):
+            self.record_button.configure(
+                text=button_states.record_text,
+                state='normal' if button_states.record_enabled else 'disabled'
+            )
         
-        self.settings_button.configure(
-            state='normal' if button_states['settings_enabled'] else 'disabled'
-        )
+        if last is None or button_states.settings_enabled != last.settings_enabled:
+            self.settings_button.configure(
+                state='normal' if button_states.settings_enabled else 'disabled'
+            )
         
-        self.model_select_button.configure(
-            state='normal' if button_states['model_select_enabled'] else 'disabled'
-        )
+        if last is None or button_states.model_select_enabled != last.model_select_enabled:
+            self.model_select_button.configure(
+                state='normal' if button_states.model_select_enabled else 'disabled'
+            )
+        
+        self._last_button_states = button_states
         
         # Update progress bar visibility
-        if new_state in [AppState.MODEL_LOADING, AppState.PROCESSING]:
-            self.progress_bar.grid()
-            self.progress_bar.start(10)  # Start animation
-        else:
+        if new_state & BUSY_STATES:
+            if not self._progress_running:
+                self.progress_bar.grid()
+                self.progress_bar.start(UIConstants.PROGRESS_BAR_INTERVAL_MS)  # Start animation
+                self._progress_running = True
+        elif self._progress_running:
             self.progress_bar.stop()
             self.progress_bar.grid_remove()
+            self._progress_running = False
         
         # Update status display
         self._update_status_display(self.state_manager.status_message)
 
     def _update_status_display(self, message: str):
-        """Update the status text display."""
+        """Update the status text display (state changes are already coalesced by UIStateManager)."""
+        if message == self._status_message:
+            return
+        
+        self._status_message = message
         self.status_text.config(state=tk.NORMAL)
-        self.status_text.delete('1.0', tk.END)
-        self.status_text.insert(tk.END, message)
+        self.status_text.replace('1.0', tk.END, message)
         self.status_text.config(state=tk.DISABLED)
         self.status_text.see(tk.END)
 
@@ -340,20 +360,19 @@ class MainWindow(tk.Tk):
         else:
             self.state_manager.set_state(AppState.NO_AUDIO)
 
-    def on_transcription_complete(self, transcribed_text: str, audio_file_path: str):
+    def on_transcription_complete(self, transcribed_text: str):
         """Callback when transcription is complete."""
-        # Always clean up the temporary audio file first
-        self.audio_manager.cleanup_audio_file(audio_file_path)
-        
         # Only process text if transcription was successful
         if transcribed_text.strip():
+            # Imported on first use; clipboard backend discovery is not needed at startup
+            import pyperclip
             pyperclip.copy(transcribed_text)
             # Update status with transcription result
             status_message = f"{UIConstants.STATUS_TRANSCRIPTION_COMPLETE}\n\n{transcribed_text}"
             self.state_manager.set_state(AppState.READY, status_message)
         else:
-            # Empty text means transcription failed but we still cleaned up the file
-            self.state_manager.set_state(AppState.READY, UIConstants.TRANSCRIPTION_FAILED_CLEANUP)
+            # Empty text means transcription failed or nothing was said
+            self.state_manager.set_state(AppState.READY, UIConstants.STATUS_TRANSCRIPTION_EMPTY)
 
     def on_whisper_error(self, error_message: str):
         """Callback when WhisperManager encounters an error."""
@@ -369,10 +388,10 @@ class MainWindow(tk.Tk):
         """Callback when AudioManager stops recording."""
         self.state_manager.set_state(AppState.PROCESSING)
 
-    def on_file_ready(self, filename: str):
-        """Callback when AudioManager has audio file ready for transcription."""
+    def on_audio_ready(self, pcm, samplerate: int):
+        """Callback when AudioManager has recorded audio ready for transcription."""
         if self.whisper_manager.is_model_loaded():
-            self.whisper_manager.transcribe_async(filename)
+            self.whisper_manager.transcribe_async(pcm, samplerate)
         else:
             messagebox.showwarning("No Model", UIConstants.DIALOG_NO_MODEL_FOR_RECORDING)
             self.state_manager.set_state(AppState.NO_MODEL)
@@ -387,6 +406,9 @@ class MainWindow(tk.Tk):
         if not self.state_manager.can_change_settings():
             return
             
+        # Imports sounddevice; already loaded by AudioManager, so this is cheap here
+        from SettingsWindow import SettingsWindow
+        
         try:
             settings_window = SettingsWindow(
                 self, 
@@ -471,5 +493,11 @@ class MainWindow(tk.Tk):
         # Cleanup audio manager
         self.audio_manager.cleanup()
         
+        # Stop the transcription and model loading workers
+        self.whisper_manager.cleanup()
+        
+        # Write any settings still waiting for the debounced save
+        self.settings_manager.flush()
+        
         # Destroy window
         self.destroy()
\ No newline at end of file
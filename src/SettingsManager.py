@@ -5,13 +5,22 @@ Handles loading, saving, and managing application settings.
 
 import json
 import os
+import threading
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from UIConstants import UIConstants
 
+# Shared read-only fallback for missing categories, so getters don't allocate a dict per miss
+_EMPTY = MappingProxyType({})
+
 
 class SettingsManager:
     """Manages application settings with JSON persistence."""
     
+    # Setters only mark settings dirty; the file is written once this long after the last change.
+    # Callers that must know whether the change reached disk call flush() and check its result.
+    FLUSH_DELAY_SECONDS = 0.5
+    
     def __init__(self, settings_file: str = "settings.json"):
         """
         Initialize SettingsManager.
@@ -21,6 +30,10 @@ class SettingsManager:
         """
         self.settings_file = settings_file
         self.settings: Dict[str, Any] = {}
+        # Guards self.settings against the flush timer thread
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         self._load_default_settings()
         self.load_settings()
     
@@ -50,13 +63,16 @@ class SettingsManager:
             True if settings were loaded successfully, False otherwise
         """
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    self._merge_settings(loaded_settings)
-                return True
-        except (json.JSONDecodeError, IOError) as e:
+            with open(self.settings_file, 'rb') as f:
+                loaded_settings = self._decode_settings(f.read())
+            # Merge with defaults to ensure all keys exist
+            self._merge_settings(loaded_settings)
+            return True
+        except FileNotFoundError:
+            # First run, keep default settings
+            pass
+        except (ValueError, IOError) as e:
+            # ValueError covers both invalid JSON and invalid UTF-8
             print(f"Failed to load settings: {e}")
             # Keep default settings if loading fails
         return False
@@ -68,13 +84,94 @@ class SettingsManager:
         Returns:
             True if settings were saved successfully, False otherwise
         """
+        # Held across the write so the flush timer and an explicit flush never share the .tmp file
+        with self._lock:
+            try:
+                self._write_atomic(self.settings_file, self._encode_settings())
+                self._dirty = False
+                return True
+            except (IOError, OSError) as e:
+                print(f"Failed to save settings: {e}")
+                # _dirty stays set so the next flush retries the write
+                return False
+    
+    def _encode_settings(self) -> bytes:
+        """
+        Serialize current settings as indented UTF-8 JSON.
+        
+        Returns:
+            Encoded settings file content
+        """
+        return json.dumps(self.settings, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    @staticmethod
+    def _decode_settings(data: bytes) -> Any:
+        """
+        Parse settings file content read as raw bytes.
+        
+        Args:
+            data: UTF-8 encoded JSON
+            
+        Returns:
+            Decoded JSON value
+        """
+        return json.loads(data)
+    
+    @staticmethod
+    def _write_atomic(file_path: str, data: bytes):
+        """
+        Write bytes to a file so readers see either the old or the new content, never a partial file.
+        
+        Args:
+            file_path: Destination file
+            data: Complete file content
+        """
+        tmp_file = file_path + '.tmp'
+        # Write into a sibling file, flush it to disk, then swap it in with a rename
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
-            return True
-        except IOError as e:
-            print(f"Failed to save settings: {e}")
-            return False
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, file_path)
+        except OSError:
+            # Don't leave a partial .tmp file behind
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+    
+    def _mark_dirty(self) -> bool:
+        """
+        Mark settings as changed and (re)schedule a debounced save.
+        
+        Returns:
+            True; the write result is only known once flush() runs
+        """
+        with self._lock:
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY_SECONDS, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return True
+    
+    def flush(self) -> bool:
+        """
+        Write pending changes to file immediately.
+        
+        Returns:
+            True if there was nothing to write or settings were saved successfully
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return True
+        return self.save_settings()
     
     def _merge_settings(self, loaded_settings: Dict[str, Any]):
         """
@@ -83,9 +180,16 @@ class SettingsManager:
         Args:
             loaded_settings: Settings loaded from file
         """
+        if not isinstance(loaded_settings, dict):
+            print("Ignoring settings: top-level value is not an object")
+            return
+        
         for category, values in loaded_settings.items():
-            if category in self.settings and isinstance(values, dict):
-                self.settings[category].update(values)
+            current = self.settings.get(category)
+            if isinstance(current, dict):
+                # Never let a malformed non-object value replace a whole category of defaults
+                if isinstance(values, dict):
+                    current.update(values)
             else:
                 self.settings[category] = values
     
@@ -99,7 +203,7 @@ class SettingsManager:
         Returns:
             Hotkey string for the action
         """
-        return self.settings.get("hotkeys", {}).get(action, "")
+        return self.settings.get("hotkeys", _EMPTY).get(action, "")
     
     def set_hotkey(self, action: str, hotkey: str) -> bool:
         """
@@ -110,13 +214,14 @@ class SettingsManager:
             hotkey: Hotkey string to set
             
         Returns:
-            True if hotkey was set successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if "hotkeys" not in self.settings:
-            self.settings["hotkeys"] = {}
-        
-        self.settings["hotkeys"][action] = hotkey
-        return self.save_settings()
+        with self._lock:
+            if "hotkeys" not in self.settings:
+                self.settings["hotkeys"] = {}
+            
+            self.settings["hotkeys"][action] = hotkey
+        return self._mark_dirty()
     
     def get_all_hotkeys(self) -> Dict[str, str]:
         """
@@ -125,7 +230,7 @@ class SettingsManager:
         Returns:
             Dictionary of action -> hotkey mappings
         """
-        return self.settings.get("hotkeys", {}).copy()
+        return self.settings.get("hotkeys", _EMPTY).copy()
     
     def set_all_hotkeys(self, hotkeys: Dict[str, str]) -> bool:
         """
@@ -135,20 +240,21 @@ class SettingsManager:
             hotkeys: Dictionary of action -> hotkey mappings
             
         Returns:
-            True if hotkeys were set successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if "hotkeys" not in self.settings:
-            self.settings["hotkeys"] = {}
-        
-        self.settings["hotkeys"].update(hotkeys)
-        return self.save_settings()
+        with self._lock:
+            if "hotkeys" not in self.settings:
+                self.settings["hotkeys"] = {}
+            
+            self.settings["hotkeys"].update(hotkeys)
+        return self._mark_dirty()
     
     def reset_hotkeys_to_default(self) -> bool:
         """
         Reset all hotkeys to default values.
         
         Returns:
-            True if reset was successful
+            True; the change is saved by the debounced write (use flush() for the result)
         """
         default_hotkeys = {
             "toggle_recording": UIConstants.GLOBAL_HOTKEY_TOGGLE_RECORDING,
@@ -158,7 +264,7 @@ class SettingsManager:
     
     def get_audio_device_id(self) -> Optional[int]:
         """Get configured audio device ID."""
-        return self.settings.get("audio", {}).get("device_id")
+        return self.settings.get("audio", _EMPTY).get("device_id")
     
     def set_audio_device_id(self, device_id: Optional[int]) -> bool:
         """
@@ -168,17 +274,18 @@ class SettingsManager:
             device_id: Audio device ID to set
             
         Returns:
-            True if device ID was set successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if "audio" not in self.settings:
-            self.settings["audio"] = {}
-        
-        self.settings["audio"]["device_id"] = device_id
-        return self.save_settings()
+        with self._lock:
+            if "audio" not in self.settings:
+                self.settings["audio"] = {}
+            
+            self.settings["audio"]["device_id"] = device_id
+        return self._mark_dirty()
     
     def is_global_hotkeys_enabled(self) -> bool:
         """Check if global hotkeys are enabled."""
-        return self.settings.get("ui", {}).get("global_hotkeys_enabled", True)
+        return self.settings.get("ui", _EMPTY).get("global_hotkeys_enabled", True)
     
     def set_global_hotkeys_enabled(self, enabled: bool) -> bool:
         """
@@ -188,17 +295,18 @@ class SettingsManager:
             enabled: Whether global hotkeys should be enabled
             
         Returns:
-            True if setting was saved successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if "ui" not in self.settings:
-            self.settings["ui"] = {}
-        
-        self.settings["ui"]["global_hotkeys_enabled"] = enabled
-        return self.save_settings()
+        with self._lock:
+            if "ui" not in self.settings:
+                self.settings["ui"] = {}
+            
+            self.settings["ui"]["global_hotkeys_enabled"] = enabled
+        return self._mark_dirty()
     
     def get_model_download_path(self) -> Optional[str]:
         """Get configured Whisper model download path."""
-        return self.settings.get("whisper", {}).get("model_download_path")
+        return self.settings.get("whisper", _EMPTY).get("model_download_path")
     
     def set_model_download_path(self, path: Optional[str]) -> bool:
         """
@@ -208,13 +316,14 @@ class SettingsManager:
             path: Path to store downloaded models (None for default)
             
         Returns:
-            True if path was set successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if "whisper" not in self.settings:
-            self.settings["whisper"] = {}
-        
-        self.settings["whisper"]["model_download_path"] = path
-        return self.save_settings()
+        with self._lock:
+            if "whisper" not in self.settings:
+                self.settings["whisper"] = {}
+            
+            self.settings["whisper"]["model_download_path"] = path
+        return self._mark_dirty()
     
     def get_setting(self, category: str, key: str, default: Any = None) -> Any:
         """
@@ -228,7 +337,7 @@ class SettingsManager:
         Returns:
             Setting value or default
         """
-        return self.settings.get(category, {}).get(key, default)
+        return self.settings.get(category, _EMPTY).get(key, default)
     
     def set_setting(self, category: str, key: str, value: Any) -> bool:
         """
@@ -240,13 +349,14 @@ class SettingsManager:
             value: Value to set
             
         Returns:
-            True if setting was saved successfully
+            True; the change is saved by the debounced write (use flush() for the result)
         """
-        if category not in self.settings:
-            self.settings[category] = {}
-        
-        self.settings[category][key] = value
-        return self.save_settings()
+        with self._lock:
+            if category not in self.settings:
+                self.settings[category] = {}
+            
+            self.settings[category][key] = value
+        return self._mark_dirty()
     
     def export_settings(self, file_path: str) -> bool:
         """
@@ -259,10 +369,11 @@ class SettingsManager:
             True if export was successful
         """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                data = self._encode_settings()
+            self._write_atomic(file_path, data)
             return True
-        except IOError as e:
+        except (IOError, OSError) as e:
             print(f"Failed to export settings: {e}")
             return False
     
@@ -274,13 +385,14 @@ class SettingsManager:
             file_path: Path to import settings from
             
         Returns:
-            True if import was successful
+            True if the file was read and merged; it is saved by the debounced write
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                imported_settings = json.load(f)
+            with open(file_path, 'rb') as f:
+                imported_settings = self._decode_settings(f.read())
+            with self._lock:
                 self._merge_settings(imported_settings)
-                return self.save_settings()
-        except (json.JSONDecodeError, IOError) as e:
+            return self._mark_dirty()
+        except (ValueError, IOError) as e:
             print(f"Failed to import settings: {e}")
             return False
\ No newline at end of file
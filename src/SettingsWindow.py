@@ -1,16 +1,20 @@
 import contextlib
 import os
+import stat
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter.simpledialog import Dialog
 from typing import Optional, Callable
 
-import sounddevice as sd
-
+from AudioDeviceCache import AudioDeviceCache
 from HotkeySettingsWindow import HotkeySettingsWindow
 from SettingsManager import SettingsManager
 from UIConstants import UIConstants
 
+# Home directory, resolved once for the model path browser
+_HOME = os.path.expanduser("~")
+
 
 class SettingsWindow(Dialog):
     """Enhanced settings window with tabbed interface for audio and hotkey settings."""
@@ -28,6 +32,9 @@ class SettingsWindow(Dialog):
         self.settings_manager = settings_manager
         self.on_hotkey_change = on_hotkey_change
         self.device_ids = []
+        # Created with the audio tab; None until then
+        self.hostapi_list: Optional[ttk.Combobox] = None
+        self.device_list: Optional[ttk.Combobox] = None
         super().__init__(parent)
     
     def body(self, master):
@@ -39,20 +46,32 @@ class SettingsWindow(Dialog):
         # Audio settings tab
         self.audio_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.audio_frame, text=UIConstants.SETTINGS_AUDIO_TAB)
-        self._create_audio_tab()
         
         # Hotkey settings tab
         self.hotkey_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.hotkey_frame, text=UIConstants.SETTINGS_HOTKEY_TAB)
-        self._create_hotkey_tab()
         
         # Whisper settings tab
         self.whisper_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.whisper_frame, text=UIConstants.SETTINGS_WHISPER_TAB)
-        self._create_whisper_tab()
+        
+        # Tab contents are built the first time each tab is shown
+        self._tab_builders = {
+            str(self.audio_frame): self._create_audio_tab,
+            str(self.hotkey_frame): self._create_hotkey_tab,
+            str(self.whisper_frame): self._create_whisper_tab,
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
         
         return self.audio_frame  # Return initial focus widget
     
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab's contents if it has not been shown yet."""
+        builder = self._tab_builders.pop(self.notebook.select(), None)
+        if builder:
+            builder()
+    
     def _create_audio_tab(self):
         """Create the audio device settings tab."""
         # Padding frame
@@ -63,15 +82,50 @@ class SettingsWindow(Dialog):
         
         self.hostapi_list = ttk.Combobox(content_frame, state='readonly', width=50)
         self.hostapi_list.pack(pady=(0, 10))
-        self.hostapi_list['values'] = [
-            hostapi['name'] for hostapi in sd.query_hostapis()]
         
         self.device_list = ttk.Combobox(content_frame, state='readonly', width=50)
         self.device_list.pack()
 
         self.hostapi_list.bind('<<ComboboxSelected>>', self.update_device_list)
-        with contextlib.suppress(sd.PortAudioError):
-            self.hostapi_list.current(sd.default.hostapi)
+        self._load_device_lists()
+    
+    def _load_device_lists(self):
+        """Enumerate audio devices on a worker thread; the lists are filled in when it finishes."""
+        self.hostapi_list.configure(values=[UIConstants.SETTINGS_LOADING_DEVICES], state='disabled')
+        self.hostapi_list.current(0)
+        self.device_list.configure(values=(), state='disabled')
+        self.device_list.set('')
+        self.device_ids = []
+        threading.Thread(target=self._enumerate_devices, daemon=True).start()
+    
+    def _enumerate_devices(self):
+        """Worker thread: query host APIs and devices (through the cache) off the Tk thread."""
+        try:
+            hostapis = AudioDeviceCache.get_hostapis()
+            devices_by_hostapi = AudioDeviceCache.get_input_devices_by_hostapi()
+            default_hostapi = AudioDeviceCache.get_default_hostapi()
+        except Exception as e:
+            # Any failure still posts empty lists, so the comboboxes never stay on the loading text
+            print(f"Failed to enumerate audio devices: {e}")
+            hostapis, devices_by_hostapi, default_hostapi = (), (), -1
+        
+        # Scheduled on the main window, which outlives this dialog
+        with contextlib.suppress(RuntimeError, tk.TclError):
+            self.master.after(0, self._apply_device_lists, hostapis, devices_by_hostapi, default_hostapi)
+    
+    def _apply_device_lists(self, hostapis, devices_by_hostapi, default_hostapi):
+        """Fill the host API list with enumeration results and select the default host API."""
+        if not self.hostapi_list.winfo_exists():
+            return  # Dialog was closed while enumerating
+        
+        # Per host API (device ids, names, default input device), precomputed by the cache
+        self._devices_by_hostapi = devices_by_hostapi
+        
+        self.hostapi_list.configure(values=[hostapi['name'] for hostapi in hostapis], state='readonly')
+        self.hostapi_list.set('')
+        self.device_list.configure(state='readonly')
+        if 0 <= default_hostapi < len(hostapis):
+            self.hostapi_list.current(default_hostapi)
             self.hostapi_list.event_generate('<<ComboboxSelected>>')
     
     def _create_hotkey_tab(self):
@@ -84,7 +138,7 @@ class SettingsWindow(Dialog):
         ttk.Label(
             content_frame,
             text=UIConstants.SETTINGS_HOTKEY_INSTRUCTIONS,
-            font=("Segoe UI", 9, "bold")
+            font=UIConstants.FONT_SECTION
         ).pack(anchor='w', pady=(0, 10))
         
         # Current hotkeys display
@@ -101,7 +155,7 @@ class SettingsWindow(Dialog):
             ttk.Label(
                 toggle_frame, 
                 text=hotkeys.get('toggle_recording', 'Not set'),
-                font=("Consolas", 9)
+                font=UIConstants.FONT_MONOSPACE
             ).pack(side='right')
             
             # Stop recording
@@ -111,7 +165,7 @@ class SettingsWindow(Dialog):
             ttk.Label(
                 stop_frame,
                 text=hotkeys.get('stop_recording', 'Not set'),
-                font=("Consolas", 9)
+                font=UIConstants.FONT_MONOSPACE
             ).pack(side='right')
         
         # Configure button
@@ -142,7 +196,7 @@ class SettingsWindow(Dialog):
         ttk.Label(
             content_frame,
             text=UIConstants.SETTINGS_WHISPER_INSTRUCTIONS,
-            font=("Segoe UI", 9, "bold")
+            font=UIConstants.FONT_SECTION
         ).pack(anchor='w', pady=(0, 10))
         
         # Model download path setting
@@ -158,12 +212,13 @@ class SettingsWindow(Dialog):
         current_path = ""
         if self.settings_manager:
             stored_path = self.settings_manager.get_model_download_path()
-            current_path = stored_path if stored_path else "Default (~/.cache/whisper)"
+            current_path = stored_path if stored_path else UIConstants.MODEL_PATH_DEFAULT_DISPLAY
         
+        self._path_var = tk.StringVar(self, value=current_path)
         self.path_display = ttk.Label(
             current_path_frame, 
-            text=current_path,
-            font=("Consolas", 9),
+            textvariable=self._path_var,
+            font=UIConstants.FONT_MONOSPACE,
             foreground="gray"
         )
         self.path_display.pack(anchor='w', pady=(5, 0))
@@ -215,16 +270,13 @@ class SettingsWindow(Dialog):
 
     def update_device_list(self, *args):
         """Update the device list based on selected host API."""
-        hostapi = sd.query_hostapis(self.hostapi_list.current())
-        self.device_ids = [
-            idx
-            for idx in hostapi['devices']
-            if sd.query_devices(idx)['max_input_channels'] > 0]
-        self.device_list['values'] = [
-            sd.query_devices(idx)['name'] for idx in self.device_ids]
-        default = hostapi['default_input_device']
-        if default >= 0:
-            self.device_list.current(self.device_ids.index(default))
+        device_ids, names, default_pos = self._devices_by_hostapi[self.hostapi_list.current()]
+        self.device_ids = device_ids
+        # Re-setting identical values would make the combobox rebuild its dropdown
+        if self.device_list.cget('values') != names:
+            self.device_list.configure(values=names)
+        if default_pos >= 0:
+            self.device_list.current(default_pos)
 
     def _open_hotkey_settings(self):
         """Open the dedicated hotkey settings window."""
@@ -256,10 +308,10 @@ class SettingsWindow(Dialog):
     
     def _browse_model_path(self):
         """Open directory browser for selecting model storage path."""
-        initial_dir = os.path.expanduser("~")
+        initial_dir = _HOME
         if self.settings_manager:
             current_path = self.settings_manager.get_model_download_path()
-            if current_path and os.path.exists(current_path):
+            if current_path and os.path.isdir(current_path):
                 initial_dir = current_path
         
         selected_dir = filedialog.askdirectory(
@@ -286,7 +338,13 @@ class SettingsWindow(Dialog):
         
         # Validate path if provided
         if new_path:
-            if not os.path.exists(new_path):
+            # One stat call answers both "does it exist" and "is it a directory"
+            try:
+                is_dir = stat.S_ISDIR(os.stat(new_path).st_mode)
+            except OSError:
+                is_dir = None
+            
+            if is_dir is None:
                 create = messagebox.askyesno(
                     "Directory Not Found",
                     f"Directory '{new_path}' does not exist. Create it?",
@@ -295,6 +353,7 @@ class SettingsWindow(Dialog):
                 if create:
                     try:
                         os.makedirs(new_path, exist_ok=True)
+                        is_dir = True
                     except OSError as e:
                         messagebox.showerror(
                             "Error",
@@ -305,7 +364,7 @@ class SettingsWindow(Dialog):
                 else:
                     return
             
-            if not os.path.isdir(new_path):
+            if not is_dir:
                 messagebox.showerror(
                     "Error",
                     "Selected path is not a directory.",
@@ -315,18 +374,19 @@ class SettingsWindow(Dialog):
         
         # Set the path (None if empty string)
         path_to_set = new_path if new_path else None
-        if self.settings_manager.set_model_download_path(path_to_set):
+        self.settings_manager.set_model_download_path(path_to_set)
+        # Write now so the message below reflects whether the path reached disk
+        if self.settings_manager.flush():
             # Update display
-            display_text = new_path if new_path else "Default (~/.cache/whisper)"
-            self.path_display.config(text=display_text)
+            display_text = new_path if new_path else UIConstants.MODEL_PATH_DEFAULT_DISPLAY
+            self._path_var.set(display_text)
             
             # Clear entry
             self.path_entry.delete(0, tk.END)
             
             messagebox.showinfo(
                 "Success",
-                "Model download path updated successfully.\n\n" +
-                "Note: This setting will take effect when loading new models.",
+                UIConstants.MODEL_PATH_SUCCESS_MESSAGE,
                 parent=self
             )
         else:
@@ -353,8 +413,9 @@ class SettingsWindow(Dialog):
         )
         
         if confirm:
-            if self.settings_manager.set_model_download_path(None):
-                self.path_display.config(text="Default (~/.cache/whisper)")
+            self.settings_manager.set_model_download_path(None)
+            if self.settings_manager.flush():
+                self._path_var.set(UIConstants.MODEL_PATH_DEFAULT_DISPLAY)
                 self.path_entry.delete(0, tk.END)
                 
                 messagebox.showinfo(
@@ -372,10 +433,12 @@ class SettingsWindow(Dialog):
     def validate(self):
         """Validate settings and prepare result."""
         # Get selected audio device
-        if hasattr(self, 'device_list') and self.device_ids:
+        if self.device_list is not None and self.device_ids:
             try:
-                self.result = self.device_ids[self.device_list.current()]
-                return True
+                index = self.device_list.current()
+                if index >= 0:  # -1 means nothing is selected
+                    self.result = self.device_ids[index]
+                    return True
             except (IndexError, tk.TclError):
                 pass
         
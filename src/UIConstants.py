@@ -15,6 +15,8 @@ class UIConstants:
     PADDING_LARGE = 15
     BUTTON_WIDTH = 120
     COMBOBOX_WIDTH = 200
+    # Indeterminate progress bar animation step (~30 FPS)
+    PROGRESS_BAR_INTERVAL_MS = 33
     
     # Status messages
     STATUS_READY = "(Nothing said yet)"
@@ -22,6 +24,7 @@ class UIConstants:
     STATUS_TRANSCRIBING = "Transcribing audio..."
     STATUS_MODEL_LOADING = "Loading model..."
     STATUS_TRANSCRIPTION_COMPLETE = "Text transcribed and copied to clipboard"
+    STATUS_TRANSCRIPTION_EMPTY = "Transcription failed or no speech was detected."
     
     # Button text
     BUTTON_RECORD = "Record"
@@ -65,12 +68,16 @@ class UIConstants:
     SETTINGS_AUDIO_TAB = "Audio Device"
     SETTINGS_HOTKEY_TAB = "Global Hotkeys"
     SETTINGS_WHISPER_TAB = "Whisper Models"
+    SETTINGS_LOADING_DEVICES = "Loading devices..."
     SETTINGS_HOTKEY_INSTRUCTIONS = "Configure global hotkeys that work system-wide:"
     SETTINGS_HOTKEY_NOTE = ("Note: Global hotkeys work even when the application is not in focus. "
                            "Make sure to choose combinations that don't conflict with other applications.")
     SETTINGS_WHISPER_INSTRUCTIONS = "Configure Whisper model storage location:"
     SETTINGS_WHISPER_NOTE = ("Leave blank to use the default location (~/.cache/whisper). "
                             "Choose a custom path to store models in a specific directory.")
+    MODEL_PATH_DEFAULT_DISPLAY = "Default (~/.cache/whisper)"
+    MODEL_PATH_SUCCESS_MESSAGE = ("Model download path updated successfully.\n\n"
+                                  "Note: This setting will take effect when loading new models.")
     
     # Hotkey configuration messages
     HOTKEY_CAPTURE_BUTTON = "Capture"
@@ -106,11 +113,6 @@ class UIConstants:
     RESET_HOTKEYS_TITLE = "Reset to Defaults"
     RESET_HOTKEYS_MESSAGE = "Reset all hotkeys to default values?"
     
-    # File cleanup messages
-    FILE_CLEANUP_SUCCESS = "Temporary audio file cleaned up"
-    FILE_CLEANUP_ERROR = "Failed to cleanup temporary file"
-    TRANSCRIPTION_FAILED_CLEANUP = "Transcription failed, but temporary file was cleaned up."
-    
     # Colors (for future theming)
     COLOR_RECORDING = "#ff4444"
     COLOR_SUCCESS = "#44aa44" 
@@ -120,4 +122,7 @@ class UIConstants:
     # Fonts
     FONT_STATUS = ("Segoe UI", 9)
     FONT_BUTTON = ("Segoe UI", 9)
-    FONT_LABEL = ("Segoe UI", 8)
\ No newline at end of file
+    FONT_LABEL = ("Segoe UI", 8)
+    FONT_HEADING = ("Segoe UI", 12, "bold")
+    FONT_SECTION = ("Segoe UI", 9, "bold")
+    FONT_MONOSPACE = ("Consolas", 9)
\ No newline at end of file
@@ -3,32 +3,62 @@ UI State Manager for SimpleWhisper application.
 Manages application state and coordinates UI updates.
 """
 
-from enum import Enum
-from typing import Callable, Optional
+from enum import IntFlag
+from typing import Any, Callable, NamedTuple, Optional
 from UIConstants import UIConstants
 
 
-class AppState(Enum):
-    """Application states that drive UI behavior."""
-    INITIALIZING = "initializing"
-    READY = "ready"  # Ready to record, model loaded, audio ready
-    MODEL_LOADING = "model_loading"
-    RECORDING = "recording"
-    PROCESSING = "processing"  # Transcribing
-    ERROR = "error"
-    NO_MODEL = "no_model"  # No model selected/loaded
-    NO_AUDIO = "no_audio"  # Audio system not ready
+class AppState(IntFlag):
+    """Application states that drive UI behavior (one bit each, so groups are masks)."""
+    INITIALIZING = 1
+    READY = 2  # Ready to record, model loaded, audio ready
+    MODEL_LOADING = 4
+    RECORDING = 8
+    PROCESSING = 16  # Transcribing
+    ERROR = 32
+    NO_MODEL = 64  # No model selected/loaded
+    NO_AUDIO = 128  # Audio system not ready
+
+
+class ButtonState(NamedTuple):
+    """Enabled state and labels of the main window controls for one application state."""
+    record_enabled: bool
+    record_text: str
+    record_command: str
+    settings_enabled: bool
+    model_select_enabled: bool
+
+
+# State groups used for membership checks
+_CAN_CHANGE_MODEL = AppState.READY | AppState.NO_MODEL | AppState.ERROR
+# States with work in progress (the main window shows its progress bar)
+BUSY_STATES = AppState.MODEL_LOADING | AppState.PROCESSING
+_UNAVAILABLE_STATES = AppState.NO_MODEL | AppState.NO_AUDIO | AppState.ERROR
 
 
 class UIStateManager:
     """Manages application state and coordinates UI updates."""
     
-    def __init__(self, ui_update_callback: Optional[Callable[['AppState'], None]] = None):
+    def __init__(self, ui_update_callback: Optional[Callable[['AppState'], None]] = None,
+                 schedule_idle: Optional[Callable[[Callable[[], None]], Any]] = None):
+        """
+        Initialize the state manager.
+        
+        Args:
+            ui_update_callback: Called with the new state after a state change
+            schedule_idle: Runs a function once the UI is idle (e.g. Tk's after_idle).
+                When given, bursts of state changes collapse into one callback with the
+                latest state; otherwise the callback runs synchronously in set_state.
+        """
         self._current_state = AppState.INITIALIZING
         self._ui_update_callback = ui_update_callback
+        self._schedule_idle = schedule_idle
         self._status_message = UIConstants.STATUS_READY
         self._model_name = None
         self._device_name = None
+        # All callers run on the Tk thread, so the pending state needs no lock
+        self._pending: Optional[AppState] = None
+        self._flush_scheduled = False
         
     @property
     def current_state(self) -> AppState:
@@ -63,21 +93,30 @@ class UIStateManager:
             
             # Trigger UI update callback
             if self._ui_update_callback:
-                self._ui_update_callback(new_state)
+                if self._schedule_idle is None:
+                    self._ui_update_callback(new_state)
+                else:
+                    self._queue_update(new_state)
+    
+    def _queue_update(self, new_state: AppState):
+        """Record the latest state and schedule a single UI callback for it."""
+        self._pending = new_state
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        self._schedule_idle(self._flush)
+    
+    def _flush(self):
+        """Deliver the most recent pending state to the UI callback."""
+        state = self._pending
+        self._pending = None
+        self._flush_scheduled = False
+        if state is not None:
+            self._ui_update_callback(state)
     
     def _get_default_status_message(self, state: AppState) -> str:
         """Get default status message for a given state."""
-        state_messages = {
-            AppState.INITIALIZING: "Starting up...",
-            AppState.READY: UIConstants.STATUS_READY,
-            AppState.MODEL_LOADING: UIConstants.STATUS_MODEL_LOADING,
-            AppState.RECORDING: UIConstants.STATUS_RECORDING,
-            AppState.PROCESSING: UIConstants.STATUS_TRANSCRIBING,
-            AppState.ERROR: "An error occurred",
-            AppState.NO_MODEL: "Please select a Whisper model",
-            AppState.NO_AUDIO: "Audio system not available"
-        }
-        return state_messages.get(state, UIConstants.STATUS_READY)
+        return _STATUS_BY_STATE.get(state, UIConstants.STATUS_READY)
     
     def set_model_info(self, model_name: Optional[str]):
         """Update model information."""
@@ -93,40 +132,59 @@ class UIStateManager:
         
     def can_change_model(self) -> bool:
         """Check if model changes are allowed in current state."""
-        return self._current_state in [AppState.READY, AppState.NO_MODEL, AppState.ERROR]
+        return bool(self._current_state & _CAN_CHANGE_MODEL)
         
     def can_change_settings(self) -> bool:
         """Check if settings changes are allowed in current state."""
         return self._current_state != AppState.RECORDING
     
-    def get_button_states(self) -> dict:
-        """Get button states for current application state."""
-        states = {
-            'record_enabled': False,
-            'record_text': UIConstants.BUTTON_RECORD,
-            'record_command': 'record',
-            'settings_enabled': True,
-            'model_select_enabled': True
-        }
+    def get_button_states(self) -> ButtonState:
+        """Get button states for current application state (shared between calls)."""
+        return _BUTTONS_BY_STATE[self._current_state]
+
+
+def _build_button_states(state: AppState) -> ButtonState:
+    """Build the button states for one application state."""
+    states = {
+        'record_enabled': False,
+        'record_text': UIConstants.BUTTON_RECORD,
+        'record_command': 'record',
+        'settings_enabled': True,
+        'model_select_enabled': True
+    }
+    
+    if state == AppState.READY:
+        states['record_enabled'] = True
+        states['record_text'] = UIConstants.BUTTON_RECORD
+        states['record_command'] = 'record'
         
-        if self._current_state == AppState.READY:
-            states['record_enabled'] = True
-            states['record_text'] = UIConstants.BUTTON_RECORD
-            states['record_command'] = 'record'
-            
-        elif self._current_state == AppState.RECORDING:
-            states['record_enabled'] = True
-            states['record_text'] = UIConstants.BUTTON_STOP
-            states['record_command'] = 'stop'
-            states['settings_enabled'] = False
-            states['model_select_enabled'] = False
-            
-        elif self._current_state in [AppState.MODEL_LOADING, AppState.PROCESSING]:
-            states['record_enabled'] = False
-            states['settings_enabled'] = False
-            states['model_select_enabled'] = False
-            
-        elif self._current_state in [AppState.NO_MODEL, AppState.NO_AUDIO, AppState.ERROR]:
-            states['record_enabled'] = False
-            
-        return states
\ No newline at end of file
+    elif state == AppState.RECORDING:
+        states['record_enabled'] = True
+        states['record_text'] = UIConstants.BUTTON_STOP
+        states['record_command'] = 'stop'
+        states['settings_enabled'] = False
+        states['model_select_enabled'] = False
+        
+    elif state & BUSY_STATES:
+        states['record_enabled'] = False
+        states['settings_enabled'] = False
+        states['model_select_enabled'] = False
+        
+    elif state & _UNAVAILABLE_STATES:
+        states['record_enabled'] = False
+        
+    return ButtonState(**states)
+
+
+# Default status message and button states per state, built once at import
+_STATUS_BY_STATE = {
+    AppState.INITIALIZING: "Starting up...",
+    AppState.READY: UIConstants.STATUS_READY,
+    AppState.MODEL_LOADING: UIConstants.STATUS_MODEL_LOADING,
+    AppState.RECORDING: UIConstants.STATUS_RECORDING,
+    AppState.PROCESSING: UIConstants.STATUS_TRANSCRIBING,
+    AppState.ERROR: "An error occurred",
+    AppState.NO_MODEL: "Please select a Whisper model",
+    AppState.NO_AUDIO: "Audio system not available"
+}
+_BUTTONS_BY_STATE = {state: _build_button_states(state) for state in AppState}
@@ -1,111 +1,234 @@
+import functools
+import gc
+import os
+import queue
 import threading
+import tkinter as tk
 from typing import Optional, Callable, Dict, Any
+import numpy as np
 import torch
 import whisper
 
 from SettingsManager import SettingsManager
 
+# CUDA availability does not change while the process runs
+_DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
+
 
 class WhisperManager:
+    # Whether torch's CPU thread pools have been sized for this process
+    _torch_configured = False
+
     def __init__(self, on_model_loaded: Optional[Callable[[str], None]] = None,
-                 on_transcription_complete: Optional[Callable[[str, str], None]] = None,
+                 on_transcription_complete: Optional[Callable[[str], None]] = None,
                  on_error: Optional[Callable[[str], None]] = None,
-                 settings_manager: Optional[SettingsManager] = None):
+                 settings_manager: Optional[SettingsManager] = None,
+                 root: Optional[tk.Tk] = None):
         self.model: Optional[whisper.Whisper] = None
         self.current_model_name: Optional[str] = None
-        self.loading = False
+        # Held by the loader while a load is in progress; set once self.model is ready to transcribe
+        self._load_lock = threading.Lock()
+        self._ready = threading.Event()
         self.settings_manager = settings_manager
         
         # Callbacks for UI updates
         self.on_model_loaded = on_model_loaded
-        self.on_transcription_complete = on_transcription_complete  # Now receives (text, file_path)
+        self.on_transcription_complete = on_transcription_complete
         self.on_error = on_error
+        self.root = root
+
+        self._configure_torch()
+
+        # Long-lived daemon workers, reused across loads and transcriptions. Daemon threads
+        # let the app exit at once even if a download or transcription is still running.
+        self._load_jobs = self._start_worker("whisper-load")
+        self._transcribe_jobs = self._start_worker("whisper-tx")
+
+    @staticmethod
+    def _start_worker(name: str) -> queue.Queue:
+        """Start a daemon thread that runs the (function, args) jobs put on the returned queue."""
+        jobs = queue.Queue()
+        threading.Thread(target=WhisperManager._run_jobs, args=(jobs,), name=name, daemon=True).start()
+        return jobs
+
+    @staticmethod
+    def _run_jobs(jobs: queue.Queue) -> None:
+        """Worker thread: run queued jobs in order until a None sentinel arrives."""
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            func, args = job
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Whisper worker job failed: {e}")
+
+    def _schedule_callback(self, callback: Optional[Callable], *args):
+        """Schedule a callback to run on the main thread."""
+        if callback and self.root:
+            self.root.after(0, callback, *args)
+        elif callback:
+            # Fallback if no root provided
+            callback(*args)
 
     @staticmethod
     def get_device() -> str:
-        """Get the best available device for Whisper model execution."""
-        return 'cuda' if torch.cuda.is_available() else 'cpu'
+        """Get the best available device for Whisper model execution (probed once at import)."""
+        return _DEVICE
+
+    @classmethod
+    def _configure_torch(cls) -> None:
+        """Size torch's CPU thread pools once per process, leaving a core for the Tk thread."""
+        if cls._torch_configured:
+            return
+        cls._torch_configured = True
+        if cls.get_device() == 'cuda':
+            return
+
+        # Only ever lower torch's default (physical cores), so SMT siblings are not oversubscribed
+        torch.set_num_threads(min(torch.get_num_threads(), max(1, (os.cpu_count() or 1) - 1)))
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError as e:
+            # Only allowed before torch has started any parallel work
+            print(f"Could not set torch inter-op threads: {e}")
 
     @staticmethod
-    def get_available_models():
-        """Get list of available Whisper models."""
-        return whisper.available_models()
+    @functools.lru_cache(maxsize=1)
+    def get_available_models() -> tuple[str, ...]:
+        """Get the available Whisper model names (computed once)."""
+        return tuple(whisper.available_models())
 
     def load_model_async(self, model_name: str) -> None:
         """Load a Whisper model asynchronously."""
-        if self.loading:
-            if self.on_error:
-                self.on_error("Model is already loading. Please wait.")
-            return
-        
         if not model_name:
             if self.on_error:
                 self.on_error("Please select a model first.")
             return
 
-        self.loading = True
-        thread = threading.Thread(target=self._load_model_worker, args=(model_name,))
-        thread.daemon = True
-        thread.start()
+        # Check and claim in one step so two quick requests cannot both start a load
+        if not self._load_lock.acquire(blocking=False):
+            if self.on_error:
+                self.on_error("Model is already loading. Please wait.")
+            return
+
+        self._ready.clear()
+        self._load_jobs.put((self._load_model_worker, (model_name,)))
 
     def _load_model_worker(self, model_name: str) -> None:
         """Worker method to load model in background thread."""
+        self._release_model()
         try:
             download_root = self.settings_manager.get_model_download_path()
-            self.model = whisper.load_model(model_name, download_root=download_root)
+            self.model = whisper.load_model(model_name, device=self.get_device(),
+                                            download_root=download_root)
+            if self.get_device() == 'cuda':
+                self._warm_up()
 
             self.current_model_name = model_name
-            self.loading = False
+            self._ready.set()
+
+            self._schedule_callback(self.on_model_loaded, model_name)
 
-            if self.on_model_loaded:
-                self.on_model_loaded(model_name)
-                
         except Exception as e:
             self.model = None
             self.current_model_name = None
-            self.loading = False
 
-            if self.on_error:
-                self.on_error(f"Failed to load model '{model_name}': {str(e)}")
+            self._schedule_callback(self.on_error, f"Failed to load model '{model_name}': {str(e)}")
 
-    def transcribe_async(self, audio_file_path: str) -> None:
-        """Transcribe an audio file asynchronously."""
+        finally:
+            self._load_lock.release()
+
+    def _release_model(self) -> None:
+        """Drop the current model and return its memory before a replacement is loaded."""
+        if self.model is None:
+            return
+        self.model = None
+        self.current_model_name = None
+        gc.collect()
+        if self.get_device() == 'cuda':
+            torch.cuda.empty_cache()
+
+    def _warm_up(self) -> None:
+        """
+        Run one transcription of silence so kernel selection and CUDA initialisation
+        happen while the UI still shows the model as loading.
+        """
+        # Whisper always encodes fixed 30 s windows, so the autotuned algorithms are reused
+        torch.backends.cudnn.benchmark = True
+        try:
+            with torch.inference_mode():
+                self.model.transcribe(np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32), fp16=True)
+        except Exception as e:
+            print(f"Model warm-up failed: {e}")
+
+    @staticmethod
+    def _to_whisper_audio(pcm: np.ndarray, samplerate: int) -> np.ndarray:
+        """
+        Convert recorded PCM samples into the mono float32 16 kHz array Whisper expects.
+        
+        Args:
+            pcm: Recorded samples, shape (frames, channels)
+            samplerate: Sample rate of the recording
+            
+        Returns:
+            1-D float32 array in the range [-1, 1] at whisper.audio.SAMPLE_RATE
+        """
+        # Normalise before downmixing: mean() of integer samples is float64 and hides the dtype
+        if np.issubdtype(pcm.dtype, np.integer):
+            # Full-scale divisor (32768.0 for int16), the same scaling whisper.load_audio uses
+            audio = pcm.astype(np.float32) / np.float32(-np.iinfo(pcm.dtype).min)
+        else:
+            audio = pcm.astype(np.float32, copy=False)
+        audio = audio.mean(axis=1) if audio.ndim > 1 and audio.shape[1] > 1 else audio.reshape(-1)
+
+        target_rate = whisper.audio.SAMPLE_RATE
+        if samplerate != target_rate:
+            # Only hit when the device refused 16 kHz; box-filter then interpolate
+            ratio = samplerate / target_rate
+            width = int(round(ratio))
+            if width > 1:
+                audio = np.convolve(audio, np.full(width, 1.0 / width, dtype=np.float32), mode='same')
+            positions = np.arange(int(len(audio) / ratio)) * ratio
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+        return audio
+
+    def transcribe_async(self, pcm: np.ndarray, samplerate: int) -> None:
+        """Transcribe recorded audio samples asynchronously."""
         if not self.model:
             if self.on_error:
                 self.on_error("No model loaded. Please select and load a model first.")
             return
 
-        if not audio_file_path:
+        if pcm is None or not len(pcm):
             if self.on_error:
-                self.on_error("No audio file provided for transcription.")
+                self.on_error("No audio provided for transcription.")
             return
 
-        thread = threading.Thread(target=self._transcribe_worker, args=(audio_file_path,))
-        thread.daemon = True
-        thread.start()
+        self._transcribe_jobs.put((self._transcribe_worker, (pcm, samplerate)))
 
-    def _transcribe_worker(self, audio_file_path: str) -> None:
+    def _transcribe_worker(self, pcm: np.ndarray, samplerate: int) -> None:
         """Worker method to transcribe audio in background thread."""
         try:
-            result = self.model.transcribe(audio_file_path)
+            audio = self._to_whisper_audio(pcm, samplerate)
+            # Half precision on CUDA; on CPU whisper would warn and fall back to FP32 on every call
+            # No autograd bookkeeping: the model is only ever run forward
+            with torch.inference_mode():
+                result = self.model.transcribe(audio, fp16=self.get_device() == 'cuda')
             transcribed_text = result.get("text", "").strip()
             
-            if self.on_transcription_complete:
-                # Pass both the transcribed text and the file path for cleanup
-                self.on_transcription_complete(transcribed_text, audio_file_path)
+            self._schedule_callback(self.on_transcription_complete, transcribed_text)
                 
         except Exception as e:
-            # Even if transcription fails, we should clean up the file
-            if self.on_transcription_complete:
-                # Pass empty text and file path for cleanup
-                self.on_transcription_complete("", audio_file_path)
-                
-            if self.on_error:
-                self.on_error(f"Transcription failed: {str(e)}")
+            # Report an empty result so the UI leaves the processing state
+            self._schedule_callback(self.on_transcription_complete, "")
+            self._schedule_callback(self.on_error, f"Transcription failed: {str(e)}")
 
     def is_model_loaded(self) -> bool:
         """Check if a model is currently loaded and ready."""
-        return self.model is not None and not self.loading
+        return self._ready.is_set()
 
     def get_current_model_name(self) -> Optional[str]:
         """Get the name of the currently loaded model."""
@@ -113,4 +236,14 @@ class WhisperManager:
 
     def is_loading(self) -> bool:
         """Check if a model is currently being loaded."""
-        return self.loading
\ No newline at end of file
+        return self._load_lock.locked()
+
+    def cleanup(self) -> None:
+        """Stop the workers, dropping any queued work."""
+        for jobs in (self._load_jobs, self._transcribe_jobs):
+            try:
+                while True:
+                    jobs.get_nowait()
+            except queue.Empty:
+                pass
+            jobs.put(None)
\ No newline at end of file